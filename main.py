@@ -1,26 +1,43 @@
 import argparse
 import csv
+import heapq
 import os
-from typing import Any, List, Tuple
+import sys
+from collections import defaultdict
+from contextlib import closing
+from operator import itemgetter
+from typing import (
+    Any, Callable, ClassVar, Dict, Generator, Iterable, List, Optional,
+    Tuple, TypeVar
+)
 
-from tabulate import tabulate
+try:
+    from mypy_extensions import mypyc_attr
+except ImportError:  # нужен только для сборки через mypyc
+    _T = TypeVar("_T")
+
+    def mypyc_attr(*attrs: str, **kwattrs: object) -> Callable[[_T], _T]:
+        return lambda cls: cls
+
+Rows = Generator[List[str], None, None]
 
 
 class CSVReader:
     """
-    Читает CSV-файл и возвращает данные в виде списка списков.
+    Читает CSV-файл и возвращает заголовки и строки данных.
     """
 
     @staticmethod
-    def read(file_path: str) -> List[List[str]]:
+    def read(file_path: str) -> Tuple[List[str], Rows]:
         """
-        Считывает CSV-файл.
+        Считывает заголовки CSV-файла; строки данных читаются лениво.
 
         Args:
             file_path: Путь к файлу.
 
         Returns:
-            Данные из файла в виде списка списков строк.
+            (headers, rows): заголовки и генератор строк данных.
+            Файл закрывается, когда генератор исчерпан или закрыт.
 
         Raises:
             ValueError: Если файл не .csv.
@@ -29,10 +46,23 @@ class CSVReader:
         if not file_path.endswith(".csv"):
             raise ValueError(f"Файл должен быть в формате .csv: {file_path}")
 
-        with open(file_path, "r", encoding="utf-8") as f:
-            return list(csv.reader(f))
+        # Генератор запускается сразу: файл открывается здесь, а дальше
+        # принадлежит генератору и закрывается вместе с ним.
+        rows = CSVReader._iter_rows(file_path)
+        headers = next(rows, [])
+        return headers, rows
+
+    @staticmethod
+    def _iter_rows(file_path: str) -> Rows:
+        with open(file_path, "r", encoding="utf-8", newline="") as f:
+            yield from csv.reader(f)
+
 
+ReportResult = Tuple[List[str], List[List[Any]]]
+ReportMethod = Callable[[Iterable[List[str]], Optional[int]], ReportResult]
 
+
+@mypyc_attr(allow_interpreted_subclasses=True)
 class Report:
     """
     Генерирует отчёты на основе CSV-данных.
@@ -40,16 +70,20 @@ class Report:
     отчёта.
     """
 
+    _methods: ClassVar[Dict[Tuple[type, str], ReportMethod]] = {}
+
     @classmethod
     def generate(
-            cls, report_name: str, data: List[List[str]]
-    ) -> Tuple[List[str], List[List[Any]]]:
+            cls, report_name: str, data: Iterable[List[str]],
+            top: Optional[int] = None
+    ) -> ReportResult:
         """
         Диспетчер отчётов.
 
         Args:
             report_name: Имя отчёта.
             data: Данные CSV.
+            top: Сколько первых строк отчёта вернуть (None — все).
 
         Returns:
             (headers, report_data)
@@ -57,50 +91,79 @@ class Report:
         Raises:
             ValueError: Если отчёт не найден.
         """
-        method = getattr(cls, report_name, None)
+        return cls._resolve(report_name)(data, top)
+
+    @classmethod
+    def _resolve(cls, report_name: str) -> ReportMethod:
+        """
+        Находит метод отчёта по имени. Результат кэшируется в _methods
+        отдельно для каждого класса, чтобы наследники получали свои отчёты.
+
+        Raises:
+            ValueError: Если отчёт не найден.
+        """
+        key = (cls, report_name)
+        cached = cls._methods.get(key)
+        if cached is not None:
+            return cached
+
+        method: Optional[ReportMethod] = getattr(cls, report_name, None)
         if not method or not callable(method):
             raise ValueError(f"Отчёт '{report_name}' не найден.")
 
-        return method(data)
+        cls._methods[key] = method
+        return method
 
     @staticmethod
-    def performance(data: List[List[str]]) -> Tuple[List[str], List[List[Any]]]:
+    def performance(
+            data: Iterable[List[str]], top: Optional[int] = None
+    ) -> ReportResult:
         """
         Отчёт средняя производительность.
         Группирует по 'position', считает среднее по 'performance',
         сортирует по убыванию.
 
         Args:
-            data: Список строк CSV, включая заголовки.
+            data: Строки CSV, первая из которых — заголовки. Строки
+                перебираются один раз, без копирования.
+            top: Сколько позиций с наибольшим средним вернуть (None — все).
 
         Returns:
             Заголовки и отсортированные данные: [№, position, performance]
         """
-        headers = data[0]
-        rows = data[1:]
-
-        try:
-            pos_idx = headers.index("position")
-            perf_idx = headers.index("performance")
-        except ValueError as e:
-            raise ValueError(f"Отсутствует колонка: {e.args[0]}")
-
-        perf_data: dict[str, list[float]] = {}
-        for row in rows:
-            position = row[pos_idx]
-            performance = float(row[perf_idx])
-
-            if position not in perf_data:
-                perf_data[position] = []
-            perf_data[position].append(performance)
+        rows = iter(data)
+        headers = next(rows, [])
+
+        for col in ("position", "performance"):
+            if col not in headers:
+                raise ValueError(f"Отсутствует колонка: '{col}'")
+        pos_idx = headers.index("position")
+        perf_idx = headers.index("performance")
+
+        # position -> [сумма, количество]
+        perf_data: defaultdict[str, list[float]] = defaultdict(
+            lambda: [0.0, 0.0]
+        )
+        position: str
+        value: str
+        for position, value in map(itemgetter(pos_idx, perf_idx), rows):
+            performance: float = float(value)
+
+            entry: list[float] = perf_data[position]
+            entry[0] += performance
+            entry[1] += 1
+
+        means = [(pos, total / count) for pos, (total, count) in
+                 perf_data.items()]
+        if top is None:
+            means.sort(key=itemgetter(1), reverse=True)
+        else:
+            means = heapq.nlargest(top, means, key=itemgetter(1))
 
         result = [
-            [pos, f"{sum(perf) / len(perf):.2f}"] for pos, perf in
-            perf_data.items()
+            [str(i), pos, f"{mean:.2f}"]
+            for i, (pos, mean) in enumerate(means, start=1)
         ]
-        result.sort(key=lambda x: float(x[1]), reverse=True)
-
-        result = [[str(i + 1), *row] for i, row in enumerate(result)]
         return ["№", "position", "performance"], result
 
 
@@ -114,40 +177,80 @@ class ReportPrinter:
         self.data = data
 
     def print(self) -> None:
-        print(tabulate(self.data, headers=self.headers, disable_numparse=True))
+        """
+        Печатает таблицу в формате tabulate "simple": заголовки,
+        разделитель из '-' и строки, выровненные по левому краю.
+        Как и в tabulate, пробелы по краям ячеек данных отбрасываются.
+        Ширина считается через len(), без учёта широких символов.
+        """
+        rows = [[str(c).strip() for c in row] for row in self.data]
+        widths = [len(h) + 2 for h in self.headers]
+        for row in rows:
+            for i, cell in enumerate(row):
+                widths[i] = max(widths[i], len(cell))
+
+        lines = [
+            "  ".join(c.ljust(w) for c, w in zip(row, widths)).rstrip()
+            for row in (self.headers, ["-" * w for w in widths], *rows)
+        ]
+        sys.stdout.write("\n".join(lines) + "\n")
 
 
 class Main:
-    def __init__(self):
+    def __init__(self) -> None:
         self.parser = argparse.ArgumentParser()
         self.parser.add_argument("--files", nargs="+", required=True)
         self.parser.add_argument("--report", required=True)
+        self.parser.add_argument("--top", type=int)
 
         self.args = self.parser.parse_args()
 
-    def run(self):
-        all_data: List[List[str]] = []
+    def run(self) -> None:
+        if self.args.top is not None and self.args.top < 1:
+            self.parser.error("--top должен быть положительным числом")
 
         for file_path in self.args.files:
             if not os.path.exists(file_path):
                 self.parser.error(f"Файл не найден: {file_path}")
-            try:
-                data = CSVReader.read(file_path)
-                if not all_data:
-                    all_data = data
-                else:
-                    all_data.extend(data[1:])
-            except Exception as e:
-                self.parser.error(f"Ошибка при чтении файла {file_path}: {e}")
 
+        # Строки всех файлов передаются в отчёт потоком, без общего списка.
+        all_data = self._iter_data()
         try:
-            headers, report_data = Report.generate(self.args.report, all_data)
-        except ValueError as e:
+            headers, report_data = Report.generate(
+                self.args.report, all_data, top=self.args.top
+            )
+        except (ValueError, csv.Error) as e:
             self.parser.error(f"Ошибка при генерации отчёта: {e}")
+        finally:
+            all_data.close()
 
         printer = ReportPrinter(headers, report_data)
         printer.print()
 
+    def _iter_data(self) -> Rows:
+        """
+        Выдаёт заголовки первого непустого файла, затем строки всех файлов.
+        Файлы открываются по одному и закрываются до открытия следующего.
+        """
+        headers_sent = False
+        for file_path in self.args.files:
+            try:
+                headers, rows = CSVReader.read(file_path)
+            except Exception as e:
+                self.parser.error(f"Ошибка при чтении файла {file_path}: {e}")
+
+            with closing(rows):
+                if headers:
+                    if not headers_sent:
+                        yield headers
+                        headers_sent = True
+                    try:
+                        yield from rows
+                    except (UnicodeDecodeError, csv.Error) as e:
+                        self.parser.error(
+                            f"Ошибка при чтении файла {file_path}: {e}"
+                        )
+
 
 if __name__ == "__main__":
     main = Main()
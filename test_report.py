@@ -13,9 +13,9 @@ Bob,Manager,4.8""",
             encoding="utf-8"
         )
 
-        data = CSVReader.read(str(csv_file))
-        assert data == [
-            ["name", "position", "performance"],
+        headers, rows = CSVReader.read(str(csv_file))
+        assert headers == ["name", "position", "performance"]
+        assert list(rows) == [
             ["Alice", "Developer", "4.5"],
             ["Bob", "Manager", "4.8"]
         ]
@@ -49,10 +49,32 @@ class TestReport:
             ["2", "Frontend", "4.50"]
         ]
 
+    def test_performance_report_from_iterator(self, sample_data):
+        headers, data = Report.performance(iter(sample_data))
+        assert headers == ["№", "position", "performance"]
+        assert data == [
+            ["1", "Backend", "4.90"],
+            ["2", "Frontend", "4.50"]
+        ]
+
+    def test_performance_report_top(self, sample_data):
+        sample_data.append(["Eve", "QA", "4.7"])
+        headers, data = Report.performance(sample_data, top=2)
+        assert data == [
+            ["1", "Backend", "4.90"],
+            ["2", "QA", "4.70"]
+        ]
+
     def test_performance_position_column(self):
         data = [["name", "perf"], ["Alice", "4.5"]]
-        with pytest.raises(ValueError, match="Отсутствует колонка: "
-                                             "'position' is not in list"):
+        with pytest.raises(ValueError,
+                           match="^Отсутствует колонка: 'position'$"):
+            Report.performance(data)
+
+    def test_performance_performance_column(self):
+        data = [["name", "position"], ["Alice", "Backend"]]
+        with pytest.raises(ValueError,
+                           match="^Отсутствует колонка: 'performance'$"):
             Report.performance(data)
 
     def test_invalid_performance_value(self, sample_data):
@@ -66,6 +88,19 @@ class TestReport:
         assert headers == ["№", "position", "performance"]
         assert len(data) == 2
 
+    def test_generate_report_subclass_override(self, sample_data):
+        class CustomReport(Report):
+            @staticmethod
+            def performance(data, top=None):
+                return ["custom"], []
+
+        Report.generate("performance", sample_data)
+        assert CustomReport.generate("performance", sample_data) == (
+            ["custom"], []
+        )
+        headers, _ = Report.generate("performance", sample_data)
+        assert headers == ["№", "position", "performance"]
+
     def test_generate_report_not_found(self, sample_data):
         with pytest.raises(ValueError, match="Отчёт 'unknown' не найден."):
             Report.generate("unknown", sample_data)
@@ -88,6 +123,30 @@ class TestReportPrinter:
         assert "performance" in output
         assert "---" in output
 
+    def test_print_report_exact_output(self, capsys):
+        headers = ["№", "position", "performance"]
+        data = [["1", "Backend Developer", "4.83"],
+                ["2", "Тестировщик", "4.50"],
+                ["3", " lead ", "4.00 "]]
+        ReportPrinter(headers, data).print()
+
+        assert capsys.readouterr().out == (
+            "№    position           performance\n"
+            "---  -----------------  -------------\n"
+            "1    Backend Developer  4.83\n"
+            "2    Тестировщик        4.50\n"
+            "3    lead               4.00\n"
+        )
+
+    def test_print_empty_report(self, capsys):
+        headers = ["№", "position", "performance"]
+        ReportPrinter(headers, []).print()
+
+        assert capsys.readouterr().out == (
+            "№    position    performance\n"
+            "---  ----------  -------------\n"
+        )
+
 
 class TestMain:
     @patch("main.ReportPrinter")
@@ -98,12 +157,18 @@ class TestMain:
                               mock_printer):
         mock_exists.return_value = True
 
-        mock_read.return_value = [
+        mock_read.side_effect = lambda path: (
             ["name", "position", "performance"],
-            ["Alice", "Backend", "4.8"]
-        ]
+            (row for row in [["Alice", "Backend", "4.8"]])
+        )
 
-        mock_generate.return_value = (["№", "position"], [["1", "Backend"]])
+        consumed = []
+
+        def generate(report_name, data, top=None):
+            consumed.extend(data)
+            return ["№", "position"], [["1", "Backend"]]
+
+        mock_generate.side_effect = generate
         mock_printer_instance = MagicMock()
         mock_printer.return_value = mock_printer_instance
 
@@ -114,10 +179,111 @@ class TestMain:
             main.run()
 
         assert mock_read.call_count == 2
-        mock_generate.assert_called_once_with("performance",
-                                              mock_read.return_value)
+        mock_generate.assert_called_once()
+        report_name, _ = mock_generate.call_args.args
+        assert report_name == "performance"
+        assert mock_generate.call_args.kwargs == {"top": None}
+        assert consumed == [
+            ["name", "position", "performance"],
+            ["Alice", "Backend", "4.8"],
+            ["Alice", "Backend", "4.8"]
+        ]
         mock_printer_instance.print.assert_called_once()
 
+    def test_main_first_file_empty(self, tmp_path, capsys):
+        empty = tmp_path / "empty.csv"
+        empty.write_text("", encoding="utf-8")
+        data = tmp_path / "data.csv"
+        data.write_text("name,position,performance\nAlice,Backend,4.8\n",
+                        encoding="utf-8")
+
+        with patch("sys.argv", ["main.py", "--files", str(empty), str(data),
+                                "--report", "performance"]):
+            main = Main()
+            main.run()
+
+        assert "Backend" in capsys.readouterr().out
+
+    def test_main_streams_files_and_closes_them(self, tmp_path):
+        paths = []
+        for i in range(3):
+            path = tmp_path / f"data{i}.csv"
+            path.write_text("name,position,performance\n"
+                            "Alice,Backend,bad\nBob,QA,4.0\n",
+                            encoding="utf-8")
+            paths.append(str(path))
+
+        real_open = open
+        opened = []
+
+        def spy_open(*args, **kwargs):
+            f = real_open(*args, **kwargs)
+            opened.append(f)
+            return f
+
+        with patch("sys.argv", ["main.py", "--files", *paths,
+                                "--report", "performance"]), \
+                patch("builtins.open", side_effect=spy_open), \
+                patch("argparse.ArgumentParser.error",
+                      side_effect=SystemExit):
+            with pytest.raises(SystemExit):
+                main = Main()
+                main.run()
+
+        # Отчёт упал на первой строке первого файла: остальные файлы
+        # не открывались, открытый файл закрыт.
+        assert len(opened) == 1
+        assert opened[0].closed
+
+    def test_main_closes_files_on_report_error(self, tmp_path):
+        paths = []
+        for i in range(2):
+            path = tmp_path / f"data{i}.csv"
+            path.write_text("name,position,performance\n"
+                            "Alice,Backend,bad\n",
+                            encoding="utf-8")
+            paths.append(str(path))
+
+        real_open = open
+        opened = []
+
+        def spy_open(*args, **kwargs):
+            f = real_open(*args, **kwargs)
+            opened.append(f)
+            return f
+
+        with patch("sys.argv", ["main.py", "--files", *paths,
+                                "--report", "performance"]), \
+                patch("builtins.open", side_effect=spy_open), \
+                patch("argparse.ArgumentParser.error",
+                      side_effect=SystemExit):
+            with pytest.raises(SystemExit):
+                main = Main()
+                main.run()
+
+        assert opened
+        assert all(f.closed for f in opened)
+
+    def test_main_decode_error_names_file(self, tmp_path):
+        good = tmp_path / "good.csv"
+        good.write_text("name,position,performance\nAlice,Backend,4.8\n",
+                        encoding="utf-8")
+        bad = tmp_path / "bad.csv"
+        # Битые байты дальше первого буфера чтения, то есть в теле файла.
+        bad.write_bytes(b"name,position,performance\n"
+                        + b"Bob,QA,4.0\n" * 2000 + b"Eve,\xff\xfe,4.1\n")
+
+        with patch("sys.argv", ["main.py", "--files", str(good), str(bad),
+                                "--report", "performance"]):
+            with patch("argparse.ArgumentParser.error",
+                       side_effect=SystemExit) as mock_error:
+                with pytest.raises(SystemExit):
+                    main = Main()
+                    main.run()
+
+        message = mock_error.call_args.args[0]
+        assert message.startswith(f"Ошибка при чтении файла {bad}:")
+
     @patch("main.CSVReader.read")
     def test_main_file_not_found(self, mock_read):
         mock_read.side_effect = FileNotFoundError("No such file")
@@ -131,6 +297,16 @@ class TestMain:
                     main.run()
                 mock_error.assert_called()
 
+    def test_main_invalid_top(self):
+        with patch("sys.argv", ["main.py", "--files", "data.csv", "--report",
+                                "performance", "--top", "0"]):
+            with patch("argparse.ArgumentParser.error",
+                       side_effect=SystemExit) as mock_error:
+                with pytest.raises(SystemExit):
+                    main = Main()
+                    main.run()
+                mock_error.assert_called()
+
     @patch("main.CSVReader.read")
     def test_main_read_error(self, mock_read):
         mock_read.side_effect = ValueError("Invalid CSV")
@@ -147,8 +323,8 @@ class TestMain:
     @patch("main.Report.generate")
     @patch("main.CSVReader.read")
     def test_main_report_not_found(self, mock_read, mock_generate):
-        mock_read.return_value = [["name", "position", "performance"],
-                                  ["Alice", "Backend", "4.8"]]
+        mock_read.return_value = (["name", "position", "performance"],
+                                  [["Alice", "Backend", "4.8"]])
         mock_generate.side_effect = ValueError("Отчёт 'unknown' не найден.")
 
         with patch("sys.argv", ["main.py", "--files", "data.csv", "--report",